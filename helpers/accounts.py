@@ -0,0 +1,109 @@
+"""helpers/accounts.py
+
+Multi-account (multi-brand) configuration for publish_all.
+- load_accounts(path): accounts from a JSON config, each merged over the config 'defaults'
+- group_by_content(accounts): accounts that share topic + template share one generated asset set
+- account_env(account, base, accounts): subprocess env carrying only that account's credentials
+- credential_problems(account, platform, base): why an account cannot publish to a platform
+- AccountLimiter: per-account concurrency cap and minimum spacing between publishes
+
+The config never holds secrets. 'credentials' maps each publisher variable (e.g.
+LINKEDIN_ACCESS_TOKEN) to the name of the environment variable / GitHub secret that holds
+the value for that account. See accounts.example.json.
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, List
+
+ACCOUNTS_CONFIG = os.getenv('ACCOUNTS_CONFIG', 'accounts.json')
+
+# Variables each publish_* script reads
+PLATFORM_CREDENTIALS = {
+    'youtube': ('YOUTUBE_CLIENT_ID', 'YOUTUBE_CLIENT_SECRET', 'YOUTUBE_REFRESH_TOKEN'),
+    'instagram': ('FB_PAGE_ACCESS_TOKEN', 'IG_USER_ID'),
+    'linkedin': ('LINKEDIN_ACCESS_TOKEN', 'LI_OWNER_URN'),
+    'x': ('X_API_KEY', 'X_API_SECRET', 'X_ACCESS_TOKEN', 'X_ACCESS_TOKEN_SECRET', 'X_BEARER_TOKEN'),
+}
+PLATFORMS = tuple(PLATFORM_CREDENTIALS)
+# Cleared per account so credentials never leak across brands
+CREDENTIAL_VARS = tuple(var for names in PLATFORM_CREDENTIALS.values() for var in names)
+
+DEFAULTS = {
+    'topic': 'AI productivity hacks',
+    'template': 'templates/prompt_templates.md',
+    'platforms': list(PLATFORMS),
+    'max_concurrency': 2,
+    'min_interval_seconds': 0,
+    'credentials': {},
+}
+
+def load_accounts(path: str = ACCOUNTS_CONFIG) -> List[dict]:
+    with open(path) as f:
+        config = json.load(f)
+    defaults = dict(DEFAULTS, **config.get('defaults', {}))
+    accounts = []
+    for entry in config.get('accounts', []):
+        if 'name' not in entry:
+            raise ValueError(f'Account entry without a name in {path}: {entry}')
+        account = dict(defaults, **entry)
+        unknown = set(account['platforms']) - set(PLATFORMS)
+        if unknown:
+            raise ValueError(f'Account {account["name"]} has unknown platforms: {sorted(unknown)}')
+        accounts.append(account)
+    return accounts
+
+def group_by_content(accounts: List[dict]) -> Dict[tuple, List[dict]]:
+    """{(topic, template): [accounts]} — each group is generated once and published by all its accounts."""
+    groups = {}
+    for account in accounts:
+        groups.setdefault((account['topic'], account['template']), []).append(account)
+    return groups
+
+def account_env(account: dict, base: dict, accounts: List[dict] = ()) -> dict:
+    """Copy of base without any publisher variable or any other account's secrets,
+    with this account's secrets mapped onto the publisher variables.
+    """
+    own = set(account['credentials'].values())
+    others = {name for a in accounts for name in a['credentials'].values()} - own
+    env = {k: v for k, v in base.items() if k not in CREDENTIAL_VARS and k not in others}
+    for var, secret_name in account['credentials'].items():
+        if var not in CREDENTIAL_VARS:
+            print(f'[{account["name"]}] Ignoring unknown credential variable {var}')
+        elif secret_name in base:
+            env[var] = base[secret_name]
+    return env
+
+def credential_problems(account: dict, platform: str, base: dict) -> List[str]:
+    """Empty if every credential the account maps for platform resolves to a set secret.
+    Publishers exit 0 when credentials are missing, so callers must treat problems as failures.
+    """
+    mapped = {var: name for var, name in account['credentials'].items() if var in PLATFORM_CREDENTIALS[platform]}
+    if not mapped:
+        return [f'no {platform} credentials mapped']
+    return [f'{name} not set (for {var})' for var, name in mapped.items() if not base.get(name)]
+
+class AccountLimiter:
+    """Context manager allowing at most max_concurrency publishes at once for one account,
+    with starts spaced at least min_interval seconds apart.
+    """
+    def __init__(self, max_concurrency: int = 1, min_interval: float = 0):
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+        self.min_interval = min_interval
+
+    def __enter__(self):
+        self._slots.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc):
+        self._slots.release()
+        return False
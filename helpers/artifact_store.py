@@ -0,0 +1,186 @@
+"""helpers/artifact_store.py
+
+Content-addressed artifact store that survives between GitHub Actions runs.
+- blobs/<sha256[:2]>/<sha256>: file contents, stored once however many keys point at them
+- index.json: {lookup key: {'sha': ..., 'size': ..., 'last_used': ...}}
+
+Stages build a lookup key from their inputs with key_for(...) and call get_file/get_bytes
+before recomputing; on a miss they compute and put_file/put_bytes the result.
+Between runs the whole store is packed into one .tar.gz (save) which the workflow caches,
+and unpacked at the start of the next run (restore). prune(max_bytes) evicts the least
+recently used entries so the archive stays bounded.
+
+Usage (workflow): python -m helpers.artifact_store restore|save [archive]
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+from typing import Optional
+
+STORE_DIR = os.getenv('ARTIFACT_STORE_DIR', '.cache/artifacts')
+ARCHIVE_PATH = os.getenv('ARTIFACT_STORE_ARCHIVE', '.cache/artifacts.tar.gz')
+MAX_BYTES = int(os.getenv('ARTIFACT_STORE_MAX_MB', '1024')) * 1024 * 1024
+ENABLED = os.getenv('ARTIFACT_STORE', 'true').lower() != 'false'
+
+def key_for(*parts) -> str:
+    """Stable SHA-256 lookup key for a stage's inputs (any JSON-serialisable values)."""
+    blob = json.dumps(parts, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(blob).hexdigest()
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+class ArtifactStore:
+    def __init__(self, root: str = STORE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, 'index.json')
+        self.hits = 0
+        self.misses = 0
+        # stages may store from worker threads (e.g. parallel clip encodes)
+        self._lock = threading.RLock()
+        try:
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        except Exception:
+            self.index = {}
+
+    def _blob_path(self, sha: str) -> str:
+        return os.path.join(self.root, 'blobs', sha[:2], sha)
+
+    def _save_index(self):
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.index, f)
+            os.replace(tmp, self.index_path)
+
+    def _lookup(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self.index.get(key)
+            if entry and os.path.exists(self._blob_path(entry['sha'])):
+                entry['last_used'] = time.time()
+                self._save_index()
+                self.hits += 1
+                return self._blob_path(entry['sha'])
+            self.misses += 1
+            return None
+
+    def _add_blob(self, key: str, src_path: str, sha: str):
+        dest = self._blob_path(sha)
+        if not os.path.exists(dest):
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dest), suffix='.tmp')
+            os.close(fd)
+            shutil.copyfile(src_path, tmp)
+            os.replace(tmp, dest)
+        with self._lock:
+            self.index[key] = {'sha': sha, 'size': os.path.getsize(dest), 'last_used': time.time()}
+            self._save_index()
+
+    def get_file(self, key: str, dest: str) -> bool:
+        """Copy the artifact stored under key to dest. Returns False on a miss."""
+        blob = self._lookup(key)
+        if blob is None:
+            return False
+        if os.path.dirname(dest):
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+        shutil.copyfile(blob, dest)
+        return True
+
+    def put_file(self, key: str, path: str):
+        self._add_blob(key, path, file_sha256(path))
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        blob = self._lookup(key)
+        if blob is None:
+            return None
+        with open(blob, 'rb') as f:
+            return f.read()
+
+    def put_bytes(self, key: str, data: bytes):
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(data)
+        try:
+            self._add_blob(key, f.name, hashlib.sha256(data).hexdigest())
+        finally:
+            os.remove(f.name)
+
+    def total_size(self) -> int:
+        return sum(e['size'] for e in {e['sha']: e for e in self.index.values()}.values())
+
+    def prune(self, max_bytes: int = MAX_BYTES):
+        """Evict least recently used entries until the stored blobs fit in max_bytes."""
+        with self._lock:
+            by_age = sorted(self.index.items(), key=lambda kv: kv[1]['last_used'])
+            while by_age and self.total_size() > max_bytes:
+                key, _ = by_age.pop(0)
+                del self.index[key]
+            live = {e['sha'] for e in self.index.values()}
+            blobs_dir = os.path.join(self.root, 'blobs')
+            for dirpath, _, files in os.walk(blobs_dir):
+                for name in files:
+                    if name not in live:
+                        os.remove(os.path.join(dirpath, name))
+            self._save_index()
+
+    def pack(self, archive_path: str = ARCHIVE_PATH):
+        if os.path.dirname(archive_path):
+            os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+        with tarfile.open(archive_path, 'w:gz') as tar:
+            tar.add(self.root, arcname='.')
+
+    @classmethod
+    def unpack(cls, archive_path: str = ARCHIVE_PATH, root: str = STORE_DIR) -> 'ArtifactStore':
+        if os.path.exists(archive_path):
+            os.makedirs(root, exist_ok=True)
+            with tarfile.open(archive_path, 'r:gz') as tar:
+                if hasattr(tarfile, 'data_filter'):
+                    tar.extractall(root, filter='data')
+                else:
+                    # older Pythons without extraction filters: allow only regular files/dirs under root
+                    base = os.path.realpath(root)
+                    for member in tar.getmembers():
+                        target = os.path.realpath(os.path.join(root, member.name))
+                        if not (member.isfile() or member.isdir()) or os.path.commonpath([base, target]) != base:
+                            raise RuntimeError(f'Refusing to extract {member.name!r} from {archive_path}')
+                    tar.extractall(root)
+        return cls(root)
+
+_default = None
+
+def default_store() -> Optional[ArtifactStore]:
+    """Shared store for the current process, or None when ARTIFACT_STORE=false."""
+    global _default
+    if not ENABLED:
+        return None
+    if _default is None:
+        _default = ArtifactStore()
+    return _default
+
+def main():
+    action = sys.argv[1] if len(sys.argv) > 1 else 'save'
+    archive = sys.argv[2] if len(sys.argv) > 2 else ARCHIVE_PATH
+    if action == 'restore':
+        store = ArtifactStore.unpack(archive)
+        print(f'Restored artifact store: {len(store.index)} entries, {store.total_size()} bytes')
+    elif action == 'save':
+        store = ArtifactStore()
+        store.prune()
+        store.pack(archive)
+        print(f'Saved artifact store: {len(store.index)} entries, {store.total_size()} bytes -> {archive}')
+    else:
+        print('Usage: python -m helpers.artifact_store restore|save [archive]')
+
+if __name__ == '__main__':
+    main()
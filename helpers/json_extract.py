@@ -0,0 +1,172 @@
+"""helpers/json_extract.py
+
+Tolerant JSON extraction for model output:
+- iter_json_objects(text): scans once for balanced top-level {...} spans, ignoring braces in strings;
+  yields (span, truncated)
+- repair_json(text, smart_quotes): fixes trailing commas (outside strings) and // comments; optionally “smart” delimiters
+- extract_content(text): returns the first object matching the content schema, or None
+- accumulate_stats(store): adds this run's EXTRACTION_STATS to the running totals kept in the artifact store
+
+Local extraction is much cheaper than a second model call, so generate_text only asks
+ChatGPT to restructure when extract_content returns None. EXTRACTION_STATS counts which
+path each run took ('direct', 'extracted', 'repaired', 'truncated', 'restructure', 'heuristic').
+Truncated output (e.g. a reply cut off at max_output_tokens) is only accepted when the
+field that was cut is optional; that field is dropped rather than published half-written.
+"""
+import json
+import re
+from collections import Counter
+from typing import Iterator, Optional, Tuple
+from helpers.artifact_store import key_for
+
+EXTRACTION_STATS = Counter()
+
+# Keys generate_text expects in content.json and their JSON types
+CONTENT_SCHEMA = {
+    'title': str,
+    'linkedin_post': str,
+    'x_post': str,
+    'ig_carousel': list,
+    'yt_script': str,
+    'hashtags': list,
+}
+REQUIRED_KEYS = ('title', 'linkedin_post', 'x_post', 'ig_carousel')
+
+_SMART_QUOTES = {'“': '"', '”': '"'}
+_LINE_COMMENT = re.compile(r'^\s*//.*$', re.MULTILINE)
+
+def iter_json_objects(text: str) -> Iterator[Tuple[str, bool]]:
+    """Yield (span, truncated) for each outermost {...} span in text, in order.
+    String literals are tracked so braces inside values do not affect nesting.
+    An object still open at the end of the text is yielded with its brackets closed
+    and truncated=True.
+    """
+    depth = 0
+    start = None
+    in_str = False
+    escape = False
+    stack = []
+    for i, ch in enumerate(text):
+        if in_str:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_str = False
+            continue
+        if ch == '"' and depth:
+            in_str = True
+        elif ch in '{[':
+            if ch == '{' and depth == 0:
+                start = i
+            if start is not None:
+                depth += 1
+                stack.append('}' if ch == '{' else ']')
+        elif ch in '}]' and depth:
+            depth -= 1
+            stack.pop()
+            if depth == 0:
+                yield text[start:i + 1], False
+                start = None
+    if start is not None:
+        # truncated output: close the open string and brackets
+        yield text[start:] + ('"' if in_str else '') + ''.join(reversed(stack)), True
+
+def repair_json(text: str, smart_quotes: bool = False) -> str:
+    """Structural fixes only by default. smart_quotes=True also turns typographic double
+    quotes into '"'; that breaks strings which legitimately contain them, so it is a last resort.
+    """
+    text = _LINE_COMMENT.sub('', text)
+    if smart_quotes:
+        for bad, good in _SMART_QUOTES.items():
+            text = text.replace(bad, good)
+    return _strip_trailing_commas(text)
+
+def _strip_trailing_commas(text: str) -> str:
+    """Drop commas directly before '}' or ']', leaving string contents untouched."""
+    out = []
+    pending = None  # index in out of a comma that may turn out to be trailing
+    in_str = False
+    escape = False
+    for ch in text:
+        if in_str:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+            pending = None
+        elif ch == ',':
+            pending = len(out)
+        elif ch in '}]':
+            if pending is not None:
+                out[pending] = ''
+            pending = None
+        elif not ch.isspace():
+            pending = None
+        out.append(ch)
+    return ''.join(out)
+
+def matches_schema(data) -> bool:
+    if not isinstance(data, dict):
+        return False
+    if any(k not in data for k in REQUIRED_KEYS):
+        return False
+    return all(isinstance(data[k], t) for k, t in CONTENT_SCHEMA.items() if k in data)
+
+def _loads(text: str):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+def _drop_cut_field(data: dict) -> Optional[dict]:
+    """The last key of a closed-off truncated object is the one that was cut.
+    Reject the object if that field is required, otherwise drop it.
+    """
+    cut = list(data)[-1]
+    if cut in REQUIRED_KEYS:
+        print(f'Model output truncated inside required field {cut!r}; rejecting.')
+        return None
+    print(f'Model output truncated inside {cut!r}; dropping that field.')
+    del data[cut]
+    return data
+
+def extract_content(text: str) -> Optional[dict]:
+    """Return the content dict embedded in model output, or None if nothing usable is found.
+    Tries the raw text first, then each candidate object as-is, with structural repairs,
+    and finally with smart quotes treated as delimiters.
+    """
+    if not text:
+        return None
+    data = _loads(text)
+    if matches_schema(data):
+        EXTRACTION_STATS['direct'] += 1
+        return data
+    for candidate, truncated in iter_json_objects(text):
+        attempts = (('extracted', candidate), ('repaired', repair_json(candidate)), ('repaired', repair_json(candidate, smart_quotes=True)))
+        for path, fixed in attempts:
+            data = _loads(fixed)
+            if not matches_schema(data):
+                continue
+            if truncated:
+                data = _drop_cut_field(data)
+                if data is None:
+                    break
+                path = 'truncated'
+            EXTRACTION_STATS[path] += 1
+            return data
+    return None
+
+def accumulate_stats(store) -> Counter:
+    """Merge this process's counts into the totals persisted across runs and return them."""
+    key = key_for('extraction_stats')
+    previous = store.get_bytes(key)
+    totals = Counter(json.loads(previous)) if previous else Counter()
+    totals.update(EXTRACTION_STATS)
+    store.put_bytes(key, json.dumps(totals).encode('utf-8'))
+    return totals
@@ -0,0 +1,50 @@
+"""helpers/media_probe.py
+
+Cached ffprobe metadata.
+- probe(path): ffprobe format/stream info as a dict, or None if the file is empty or unreadable
+- duration(path): container duration in seconds, or None
+
+Results are memoised per process by (path, size, mtime) and persisted in the artifact
+store by file hash, so each distinct media file is probed at most once across runs.
+"""
+import json
+import os
+import subprocess
+from typing import Optional
+from helpers.artifact_store import default_store, key_for, file_sha256
+
+_memo = {}
+
+def _ffprobe(path: str) -> Optional[dict]:
+    try:
+        out = subprocess.check_output(['ffprobe','-v','error','-show_format','-show_streams','-of','json',path])
+        return json.loads(out)
+    except Exception as e:
+        print('ffprobe failed for', path, e)
+        return None
+
+def probe(path: str) -> Optional[dict]:
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    st = os.stat(path)
+    memo_key = (os.path.abspath(path), st.st_size, st.st_mtime)
+    if memo_key in _memo:
+        return _memo[memo_key]
+    store = default_store()
+    cache_key = key_for('ffprobe', file_sha256(path))
+    cached = store.get_bytes(cache_key) if store else None
+    if cached is not None:
+        info = json.loads(cached)
+    else:
+        info = _ffprobe(path)
+        if store and info is not None:
+            store.put_bytes(cache_key, json.dumps(info).encode('utf-8'))
+    _memo[memo_key] = info
+    return info
+
+def duration(path: str) -> Optional[float]:
+    info = probe(path)
+    try:
+        return float(info['format']['duration'])
+    except (TypeError, KeyError, ValueError):
+        return None
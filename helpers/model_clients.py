@@ -11,6 +11,7 @@ import os
 import requests
 import json
 from typing import Optional
+from helpers.prompt_templates import estimate_tokens, render
 
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 GEMINI_ENDPOINT = os.getenv('GEMINI_ENDPOINT')  # optional custom endpoint
@@ -18,6 +19,10 @@ CHATGPT_API_KEY = os.getenv('CHATGPT_API_KEY')
 OPENAI_API_URL = os.getenv('OPENAI_API_URL', 'https://api.openai.com/v1/chat/completions')
 HF_API_KEY = os.getenv('HF_API_KEY')
 
+def _log_prompt(model: str, *parts: str):
+    # logged where the request is made, so cached or skipped calls don't show up as cost
+    print(f'Prompt [{model}]: {sum(len(p) for p in parts)} chars, ~{sum(estimate_tokens(p) for p in parts)} tokens')
+
 def gen_text_gemini(prompt: str, max_tokens: int = 800) -> str:
     """Generate text using Gemini 3 Pro via the Google Generative API.
     Falls back to a HuggingFace text model if Gemini is not configured.
@@ -26,6 +31,7 @@ def gen_text_gemini(prompt: str, max_tokens: int = 800) -> str:
     if GEMINI_API_KEY and GEMINI_ENDPOINT:
         headers = {'Authorization': f'Bearer {GEMINI_API_KEY}', 'Content-Type': 'application/json'}
         payload = {'prompt': prompt, 'max_output_tokens': max_tokens}
+        _log_prompt('gemini', prompt)
         try:
             resp = requests.post(GEMINI_ENDPOINT, headers=headers, json=payload, timeout=60)
             resp.raise_for_status()
@@ -41,6 +47,7 @@ def gen_text_gemini(prompt: str, max_tokens: int = 800) -> str:
         hf_model = os.getenv('HF_TEXT_MODEL','gpt2')
         hf_url = f'https://api-inference.huggingface.co/models/{hf_model}'
         headers = {'Authorization': f'Bearer {HF_API_KEY}'}
+        _log_prompt(f'hf:{hf_model}', prompt)
         try:
             r = requests.post(hf_url, headers=headers, json={'inputs': prompt}, timeout=60)
             r.raise_for_status()
@@ -58,7 +65,7 @@ def rewrite_with_chatgpt(text: str, instruction: Optional[str]=None) -> str:
     """
     if not CHATGPT_API_KEY:
         return text
-    system_msg = instruction or 'Rewrite to be concise, professional, and engaging.'
+    system_msg = instruction or render('chatgpt')
     payload = {
         'model': 'gpt-4o-mini',
         'messages': [
@@ -68,6 +75,7 @@ def rewrite_with_chatgpt(text: str, instruction: Optional[str]=None) -> str:
         'max_tokens': 400
     }
     headers = {'Authorization': f'Bearer {CHATGPT_API_KEY}', 'Content-Type': 'application/json'}
+    _log_prompt('chatgpt', system_msg, text)
     try:
         r = requests.post(OPENAI_API_URL, headers=headers, json=payload, timeout=60)
         r.raise_for_status()
@@ -84,6 +92,7 @@ def microtask_with_nano(task: str, text: str):
     nano_url = os.getenv('GEMINI_NANO_ENDPOINT')
     nano_key = os.getenv('GEMINI_NANO_KEY')
     if nano_url and nano_key:
+        _log_prompt(f'nano:{task}', text)
         try:
             r = requests.post(nano_url, headers={'Authorization':f'Bearer {nano_key}'}, json={'task':task,'text':text}, timeout=10)
             r.raise_for_status()
@@ -0,0 +1,95 @@
+"""helpers/prompt_templates.py
+
+Registry for the prompts in templates/prompt_templates.md.
+- load_registry(path): parses the Markdown file once into named sections (cached)
+- get_template(name): compiled string.Template for one section (cached)
+- render(name, variables): substitutes typed PromptVariables
+- estimate_tokens(text): rough token count; model_clients logs it for each request it sends
+
+Sections are keyed by their '## ' heading with any '(Model)' suffix dropped and the
+rest lowercased, e.g. '## Main production prompt (Gemini 3 Pro)' -> 'main production prompt'.
+The model aliases 'gemini' and 'chatgpt' resolve to their own section so each model call
+only receives the text it needs. The Nano section only documents the supported microtasks;
+Nano requests send the task name, not a prompt.
+"""
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from string import Template
+from typing import Dict, List
+
+TEMPLATES_PATH = os.getenv('PROMPT_TEMPLATES', 'templates/prompt_templates.md')
+
+SECTION_ALIASES = {
+    'gemini': 'main production prompt',
+    'chatgpt': 'rewriting prompt',
+}
+
+# Limits quoted to the model in the production prompt
+PLATFORM_LIMITS = {
+    'title': '8 words',
+    'linkedin_post': '3000 chars',
+    'x_post': '280 chars',
+    'ig_carousel': '2-10 slides',
+    'yt_script': '60 seconds',
+}
+
+@dataclass
+class PromptVariables:
+    topic: str
+    trending_signals: List[str] = field(default_factory=list)
+    platform_limits: Dict[str, str] = field(default_factory=lambda: dict(PLATFORM_LIMITS))
+
+    def as_mapping(self) -> Dict[str, str]:
+        return {
+            'topic': self.topic,
+            'trending_signals': ', '.join(self.trending_signals) or 'none provided',
+            'platform_limits': '; '.join(f'{k}: {v}' for k, v in self.platform_limits.items()),
+        }
+
+def _section_key(heading: str) -> str:
+    return re.sub(r'\s*\(.*\)\s*$', '', heading).strip().lower()
+
+def parse_sections(text: str) -> Dict[str, str]:
+    """Split Markdown text into {section key: body} using '## ' headings.
+    Anything before the first '## ' heading (the '# ' title) is ignored.
+    """
+    sections = {}
+    key = None
+    lines = []
+    for line in text.splitlines():
+        if line.startswith('## '):
+            if key is not None:
+                sections[key] = '\n'.join(lines).strip()
+            key = _section_key(line[3:])
+            lines = []
+        elif key is not None:
+            lines.append(line)
+    if key is not None:
+        sections[key] = '\n'.join(lines).strip()
+    return sections
+
+@lru_cache(maxsize=None)
+def load_registry(path: str = TEMPLATES_PATH) -> Dict[str, str]:
+    with open(path) as f:
+        return parse_sections(f.read())
+
+@lru_cache(maxsize=None)
+def get_template(name: str, path: str = TEMPLATES_PATH) -> Template:
+    key = SECTION_ALIASES.get(name, name).lower()
+    sections = load_registry(path)
+    if key not in sections:
+        raise KeyError(f'Prompt section {name!r} not found in {path} (have: {sorted(sections)})')
+    return Template(sections[key])
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for cost tracking."""
+    return max(1, (len(text) + 3) // 4) if text else 0
+
+def render(name: str, variables: PromptVariables = None, path: str = TEMPLATES_PATH) -> str:
+    """Render a section with the given variables.
+    Unknown placeholders are left untouched so literal '$' in templates is safe.
+    """
+    tpl = get_template(name, path)
+    return tpl.safe_substitute(variables.as_mapping() if variables else {})
@@ -1,33 +1,137 @@
 """helpers/validate_payloads.py
 
-Validators used when SELF_TEST is enabled. They check that generated assets exist
-and that platform payloads meet basic constraints (lengths, keys present).
+Declarative per-platform constraints and in-memory validators. Each pipeline stage
+validates what it just produced so bad content fails before later stages spend time
+rendering and encoding media for it:
+- validate_content(data): content.json fields (after generate_text)
+- image_errors(path, kind) / validate_images(paths, kind): slide and thumbnail files (after generate_images)
+- validate_video(path): final MP4 (after assemble_video)
+- validate_all_payloads(): full check of assets/ used when SELF_TEST is enabled
+
+All validators raise PayloadValidationError (an AssertionError) listing every problem found.
 """
 import json
 import os
+import re
+from helpers.media_probe import duration as probe_duration
+
+class PayloadValidationError(AssertionError):
+    pass
+
+# X counts every URL as 23 chars and most CJK/emoji code points as 2
+X_URL_LENGTH = 23
+_URL_RE = re.compile(r'https?://\S+')
+_X_LIGHT_RANGES = ((0, 4351), (8192, 8205), (8208, 8223), (8242, 8247))
+
+CONTENT_RULES = {
+    'title': {'type': str, 'min_len': 1, 'max_len': 100},            # YouTube title
+    'linkedin_post': {'type': str, 'min_len': 50, 'max_len': 3000},  # LinkedIn commentary
+    'x_post': {'type': str, 'min_len': 1, 'max_len': 280, 'length': 'x_weighted'},
+    'ig_carousel': {'type': list, 'item_type': str, 'min_items': 2, 'max_items': 10},
+    'yt_script': {'type': str, 'required': False},
+    'hashtags': {'type': list, 'item_type': str},
+}
+
+IMAGE_RULES = {
+    # Instagram feed images: aspect ratio between 4:5 and 1.91:1
+    'slide': {'min_width': 320, 'min_aspect': 0.8, 'max_aspect': 1.91},
+    # YouTube custom thumbnails
+    'thumbnail': {'min_width': 640, 'max_bytes': 2 * 1024 * 1024},
+}
+
+# YouTube Shorts
+VIDEO_RULES = {'min_duration': 1.0, 'max_duration': 60.0}
+
+def x_weighted_length(text):
+    """Length of text as counted by X: URLs are 23, wide characters are 2."""
+    n = 0
+    for part in _URL_RE.split(text):
+        for ch in part:
+            cp = ord(ch)
+            n += 1 if any(lo <= cp <= hi for lo, hi in _X_LIGHT_RANGES) else 2
+    return n + X_URL_LENGTH * len(_URL_RE.findall(text))
+
+def _raise_if(errors, what):
+    if errors:
+        raise PayloadValidationError(f'{what} failed validation: ' + '; '.join(errors))
+
+def content_errors(data):
+    if not isinstance(data, dict):
+        return ['content is not a JSON object']
+    errors = []
+    for key, rule in CONTENT_RULES.items():
+        if key not in data:
+            if rule.get('required', True):
+                errors.append(f'{key} missing')
+            continue
+        value = data[key]
+        if not isinstance(value, rule['type']):
+            errors.append(f'{key} should be {rule["type"].__name__}, got {type(value).__name__}')
+            continue
+        if rule['type'] is str:
+            length = x_weighted_length(value) if rule.get('length') == 'x_weighted' else len(value)
+            if length < rule.get('min_len', 0):
+                errors.append(f'{key} too short ({length} < {rule["min_len"]})')
+            if 'max_len' in rule and length > rule['max_len']:
+                errors.append(f'{key} too long ({length} > {rule["max_len"]})')
+        else:
+            if len(value) < rule.get('min_items', 0):
+                errors.append(f'{key} has {len(value)} items (min {rule["min_items"]})')
+            if 'max_items' in rule and len(value) > rule['max_items']:
+                errors.append(f'{key} has {len(value)} items (max {rule["max_items"]})')
+            if 'item_type' in rule and not all(isinstance(v, rule['item_type']) for v in value):
+                errors.append(f'{key} items should all be {rule["item_type"].__name__}')
+    return errors
+
+def validate_content(data):
+    _raise_if(content_errors(data), 'content')
+
+def image_errors(path, kind='slide'):
+    rule = IMAGE_RULES[kind]
+    if not os.path.exists(path):
+        return [f'{path} missing']
+    if 'max_bytes' in rule and os.path.getsize(path) > rule['max_bytes']:
+        return [f'{path} larger than {rule["max_bytes"]} bytes']
+    try:
+        from PIL import Image
+        with Image.open(path) as im:
+            width, height = im.size
+    except Exception as e:
+        return [f'{path} is not a readable image ({e})']
+    errors = []
+    if width < rule.get('min_width', 0):
+        errors.append(f'{path} width {width} < {rule["min_width"]}')
+    aspect = width / height if height else 0
+    if 'min_aspect' in rule and not rule['min_aspect'] <= aspect <= rule['max_aspect']:
+        errors.append(f'{path} aspect ratio {aspect:.2f} outside {rule["min_aspect"]}-{rule["max_aspect"]}')
+    return errors
+
+def validate_images(paths, kind='slide'):
+    errors = [] if paths else [f'no {kind} images']
+    for p in paths:
+        errors.extend(image_errors(p, kind))
+    _raise_if(errors, f'{kind} images')
+
+def validate_video(path):
+    if not os.path.exists(path):
+        _raise_if([f'{path} missing'], 'video')
+    duration = probe_duration(path)
+    errors = []
+    if duration is None:
+        errors.append(f'could not read duration of {path}')
+    elif not VIDEO_RULES['min_duration'] <= duration <= VIDEO_RULES['max_duration']:
+        errors.append(f'{path} duration {duration:.1f}s outside {VIDEO_RULES["min_duration"]}-{VIDEO_RULES["max_duration"]}s')
+    _raise_if(errors, 'video')
 
-def validate_all_payloads():
-    # Check content.json exists
-    if not os.path.exists('assets/content.json'):
-        raise AssertionError('assets/content.json missing')
-    with open('assets/content.json') as f:
-        data = json.load(f)
-    # LinkedIn post check
-    if 'linkedin_post' not in data or len(data['linkedin_post']) < 50:
-        raise AssertionError('linkedin_post missing or too short')
-    # X post check
-    if 'x_post' not in data or len(data['x_post']) > 280:
-        raise AssertionError('x_post missing or too long')
-    # Carousel check
-    if 'ig_carousel' not in data or not isinstance(data['ig_carousel'], list) or len(data['ig_carousel'])==0:
-        raise AssertionError('ig_carousel missing or empty')
-    # Hashtags
-    if 'hashtags' not in data or not isinstance(data['hashtags'], list):
-        raise AssertionError('hashtags missing or wrong format')
-    # Check media
-    images = [f for f in os.listdir('assets') if f.endswith('.png') or f.endswith('.jpg')]
-    if len(images) == 0:
-        raise AssertionError('No images found in assets/')
-    if not os.path.exists('assets/video_post.mp4'):
-        raise AssertionError('assets/video_post.mp4 missing')
+def validate_all_payloads(assets='assets'):
+    content_path = os.path.join(assets, 'content.json')
+    if not os.path.exists(content_path):
+        raise PayloadValidationError(f'{content_path} missing')
+    with open(content_path) as f:
+        validate_content(json.load(f))
+    images_dir = os.path.join(assets, 'images')
+    images = sorted(os.path.join(images_dir, f) for f in os.listdir(images_dir) if f.endswith('.png') or f.endswith('.jpg')) if os.path.isdir(images_dir) else []
+    validate_images(images, 'slide')
+    validate_images([os.path.join(assets, 'thumbnail.png')], 'thumbnail')
+    validate_video(os.path.join(assets, 'video_post.mp4'))
     print('All payload validators passed.')
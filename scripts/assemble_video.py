@@ -2,14 +2,123 @@
 
 Assembles slides and audio into a vertical MP4 using ffmpeg CLI calls.
 Usage: python scripts/assemble_video.py assets assets/video_post.mp4
+
+ASSEMBLY_MODE=segments (default): each slide is encoded once to a short H.264 clip
+keyed by (image hash, frame count, resolution, encoder settings) and cached in the
+artifact store; missing clips are encoded in parallel, then the clips are joined by
+stream copy and muxed with the audio. Only changed slides are ever re-encoded.
+ASSEMBLY_MODE=full: encodes the whole slideshow in one pass (previous behaviour).
+
+Slide timing follows the narration: the audio is probed once (cached ffprobe metadata)
+and its duration is split across slides in proportion to the length of each
+ig_carousel text, so the video ends with the audio instead of padding or cutting it.
+Without usable audio every slide gets PER_SLIDE_DURATION.
 """
-import os, sys, subprocess
+import os, sys, json, subprocess
+from concurrent.futures import ThreadPoolExecutor
+from helpers.validate_payloads import validate_video, VIDEO_RULES
+from helpers.media_probe import duration as probe_duration
+from helpers.artifact_store import default_store, key_for, file_sha256
+
+ASSEMBLY_MODE = os.getenv('ASSEMBLY_MODE', 'segments').lower()
+PER_SLIDE_DURATION = 3
+MIN_SLIDE_DURATION = 1.0
+# Headroom below VIDEO_RULES['max_duration'] so the muxed audio never pushes the container past it
+MAX_DURATION_MARGIN_FRAMES = 3
+RESOLUTION = (1080, 1920)
+# Every clip must share these so the concat step can stream-copy them
+ENCODER_SETTINGS = {'codec': 'libx264', 'preset': 'veryfast', 'crf': 23, 'fps': 30, 'pix_fmt': 'yuv420p'}
+
+def run(cmd):
+    print('Running:', ' '.join(cmd))
+    subprocess.check_call(cmd)
+
+def frame_count(duration):
+    return max(1, int(round(duration * ENCODER_SETTINGS['fps'])))
+
+def encode_slide_clip(image, frames, out_path):
+    # an exact frame count (not a rounded -t) keeps the joined clips in step with the audio
+    w, h = RESOLUTION
+    s = ENCODER_SETTINGS
+    run(['ffmpeg','-y','-loop','1','-framerate',str(s['fps']),'-i',image,'-frames:v',str(frames),
+         '-vf',f'scale={w}:{h},format={s["pix_fmt"]}','-r',str(s['fps']),
+         '-c:v',s['codec'],'-preset',s['preset'],'-crf',str(s['crf']),'-threads','1','-an',out_path])
+
+def slide_clips(images, durations, segments_dir):
+    """Return one clip path per slide, encoding (in parallel) only those not cached."""
+    os.makedirs(segments_dir, exist_ok=True)
+    store = default_store()
+    clips, todo, seen = [], [], set()
+    for image, duration in zip(images, durations):
+        frames = frame_count(duration)
+        clip_key = key_for('slide_clip', file_sha256(image), frames, RESOLUTION, ENCODER_SETTINGS)
+        clip = os.path.join(segments_dir, f'{clip_key}.mp4')
+        clips.append(clip)
+        # identical slides share a key; encode each clip once
+        if clip_key in seen or os.path.exists(clip) or (store and store.get_file(clip_key, clip)):
+            continue
+        seen.add(clip_key)
+        todo.append((image, frames, clip, clip_key))
+    print(f'Slide clips: {len(clips)} slides, {len(todo)} to encode')
+    def encode(job):
+        image, frames, clip, clip_key = job
+        tmp = clip + '.part.mp4'
+        encode_slide_clip(image, frames, tmp)
+        os.replace(tmp, clip)
+        if store:
+            store.put_file(clip_key, clip)
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+        list(pool.map(encode, todo))
+    return clips
+
+def assemble_segments(images, durations, audio, out, assets):
+    clips = slide_clips(images, durations, os.path.join(assets,'segments'))
+    concat_list = os.path.join(assets,'segments.txt')
+    with open(concat_list,'w') as f:
+        for clip in clips:
+            f.write(f"file '{os.path.abspath(clip)}'\n")
+    tmp_vid = os.path.join(assets,'temp_slideshow.mp4')
+    run(['ffmpeg','-y','-f','concat','-safe','0','-i',concat_list,'-c','copy',tmp_vid])
+    if audio:
+        run(['ffmpeg','-y','-i',tmp_vid,'-i',audio,'-c:v','copy','-c:a','aac','-t',f'{sum(durations):.3f}','-movflags','+faststart',out])
+    else:
+        run(['ffmpeg','-y','-i',tmp_vid,'-c','copy','-an','-movflags','+faststart',out])
 
-def make_inputs_txt(image_files, txt_path, per_slide_duration=3):
+def assemble_full(images, durations, audio, out, assets):
+    tmp_list = os.path.join(assets,'inputs.txt')
+    make_inputs_txt(images, tmp_list, durations)
+    tmp_vid = os.path.join(assets,'temp_slideshow.mp4')
+    run(['ffmpeg','-y','-f','concat','-safe','0','-i',tmp_list,'-vf','scale=1080:1920,format=yuv420p','-r','30',tmp_vid])
+    if audio:
+        run(['ffmpeg','-y','-i',tmp_vid,'-i',audio,'-c:v','libx264','-c:a','aac','-t',f'{sum(durations):.3f}',out])
+    else:
+        run(['ffmpeg','-y','-i',tmp_vid,'-c:v','libx264','-an',out])
+
+def slide_durations(texts, n_slides, total=None):
+    """Split total seconds across n_slides in proportion to len(texts[i]).
+    Durations are whole frames and sum exactly to total; falls back to an even split
+    when the texts do not line up with the slides.
+    """
+    if not total:
+        return [PER_SLIDE_DURATION] * n_slides
+    fps = ENCODER_SETTINGS['fps']
+    total_frames = max(int(round(total * fps)), n_slides)
+    if len(texts) == n_slides:
+        weights = [max(len(t.strip()), 1) for t in texts]
+    else:
+        weights = [1] * n_slides
+    min_frames = min(int(MIN_SLIDE_DURATION * fps), total_frames // n_slides)
+    spare = total_frames - min_frames * n_slides
+    frames = [min_frames + int(spare * w / sum(weights)) for w in weights]
+    frames[-1] += total_frames - sum(frames)
+    return [f / fps for f in frames]
+
+def make_inputs_txt(image_files, txt_path, durations):
     with open(txt_path,'w') as f:
-        for img in image_files:
+        for img, duration in zip(image_files, durations):
             f.write(f"file '{img}'\n")
-            f.write(f"duration {per_slide_duration}\n")
+            # enough precision that cumulative timestamps land on frame boundaries
+            f.write(f"duration {duration:.6f}\n")
         # repeat last frame to hold
         f.write(f"file '{image_files[-1]}'\n")
 
@@ -24,21 +133,34 @@ def main():
     if not images:
         print('No images to assemble.')
         return
-    tmp_list = os.path.join(assets,'inputs.txt')
-    make_inputs_txt(images, tmp_list)
-    tmp_vid = os.path.join(assets,'temp_slideshow.mp4')
-    # slideshow
-    cmd1 = ['ffmpeg','-y','-f','concat','-safe','0','-i',tmp_list,'-vf','scale=1080:1920,format=yuv420p','-r','30',tmp_vid]
-    print('Running:', ' '.join(cmd1))
-    subprocess.check_call(cmd1)
-    # combine with audio if present
     audio = os.path.join(assets,'audio.mp3')
-    if os.path.exists(audio) and os.path.getsize(audio) > 0:
-        cmd2 = ['ffmpeg','-y','-i',tmp_vid,'-i',audio,'-c:v','libx264','-c:a','aac','-shortest',out]
+    audio_duration = probe_duration(audio)  # None for a missing or empty placeholder
+    has_audio = bool(audio_duration)
+    max_duration = VIDEO_RULES['max_duration'] - MAX_DURATION_MARGIN_FRAMES / ENCODER_SETTINGS['fps']
+    if has_audio and audio_duration > max_duration:
+        print(f'Audio is {audio_duration:.1f}s; trimming video to {max_duration:.2f}s')
+        audio_duration = max_duration
+    try:
+        with open(os.path.join(assets,'content.json')) as f:
+            texts = json.load(f).get('ig_carousel', [])
+    except Exception:
+        texts = []
+    durations = slide_durations(texts, len(images), audio_duration if has_audio else None)
+    print('Slide durations:', ', '.join(f'{d:.2f}s' for d in durations))
+    # identical slides + audio produce an identical video; skip the encode entirely
+    store = default_store()
+    cache_key = key_for('video', ASSEMBLY_MODE, [file_sha256(i) for i in images], durations, file_sha256(audio) if has_audio else None, RESOLUTION, ENCODER_SETTINGS)
+    if store and store.get_file(cache_key, out):
+        validate_video(out)
+        print('Reused cached video at', out)
+        return
+    if ASSEMBLY_MODE == 'full':
+        assemble_full(images, durations, audio if has_audio else None, out, assets)
     else:
-        cmd2 = ['ffmpeg','-y','-i',tmp_vid,'-c:v','libx264','-an',out]
-    print('Running:', ' '.join(cmd2))
-    subprocess.check_call(cmd2)
+        assemble_segments(images, durations, audio if has_audio else None, out, assets)
+    validate_video(out)
+    if store:
+        store.put_file(cache_key, out)
     print('Video assembled at', out)
 
 if __name__ == '__main__':
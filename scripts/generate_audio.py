@@ -4,11 +4,17 @@ Generates audio using HuggingFace TTS endpoint or creates a silent placeholder.
 Usage: python scripts/generate_audio.py assets/content.json assets/audio.mp3
 """
 import os, sys, json, requests
+from helpers.artifact_store import default_store, key_for
 
 HF_API_KEY = os.getenv('HF_API_KEY')
 TTS_MODEL = os.getenv('HF_TTS_MODEL', 'facebook/tts_transformer')
 
 def hf_tts(text, out_path):
+    store = default_store()
+    cache_key = key_for('hf_tts', TTS_MODEL, text)
+    if store and store.get_file(cache_key, out_path):
+        print('Using cached TTS audio.')
+        return
     url = f'https://api-inference.huggingface.co/models/{TTS_MODEL}'
     headers = {'Authorization': f'Bearer {HF_API_KEY}'}
     payload = {'inputs': text}
@@ -16,6 +22,8 @@ def hf_tts(text, out_path):
     r.raise_for_status()
     with open(out_path, 'wb') as f:
         f.write(r.content)
+    if store and r.content:
+        store.put_file(cache_key, out_path)
 
 def main():
     src = sys.argv[1] if len(sys.argv)>1 else 'assets/content.json'
@@ -6,9 +6,12 @@ Usage: python scripts/generate_images.py assets/content.json
 """
 import os, sys, json, requests
 from PIL import Image, ImageDraw, ImageFont
+from helpers.validate_payloads import image_errors, validate_images
+from helpers.artifact_store import default_store, key_for
 
 HF_API_KEY = os.getenv('HF_API_KEY')
 HF_MODEL = os.getenv('HF_IMAGE_MODEL', 'stabilityai/stable-diffusion-xl-base-1.0')
+ASSETS_DIR = os.getenv('ASSETS_DIR', 'assets')
 
 def simple_slide(text, out_path, size=(1080,1350)):
     im = Image.new('RGB', size, (250,250,250))
@@ -20,7 +23,13 @@ def simple_slide(text, out_path, size=(1080,1350)):
         d.text((60,60), text, fill=(20,20,20))
     im.save(out_path)
 
-def hf_generate_image(prompt, out_path):
+def hf_generate_image(prompt, out_path, kind='slide'):
+    """Fetch an image from HF, reusing a cached result for the same model and prompt."""
+    store = default_store()
+    cache_key = key_for('hf_image', HF_MODEL, prompt)
+    if store and store.get_file(cache_key, out_path):
+        print('Using cached HF image for', out_path)
+        return
     url = f'https://api-inference.huggingface.co/models/{HF_MODEL}'
     headers = {'Authorization': f'Bearer {HF_API_KEY}'}
     payload = {'inputs': prompt}
@@ -29,40 +38,51 @@ def hf_generate_image(prompt, out_path):
     # HF sometimes returns image bytes directly
     with open(out_path, 'wb') as f:
         f.write(r.content)
+    if store and not image_errors(out_path, kind):
+        store.put_file(cache_key, out_path)
 
 def main():
-    src = sys.argv[1] if len(sys.argv)>1 else 'assets/content.json'
+    src = sys.argv[1] if len(sys.argv)>1 else os.path.join(ASSETS_DIR,'content.json')
     if not os.path.exists(src):
         print('Content JSON not found. Run generate_text.py first.')
         return
     with open(src) as f:
         data = json.load(f)
-    os.makedirs('assets/images', exist_ok=True)
+    images_dir = os.path.join(ASSETS_DIR,'images')
+    os.makedirs(images_dir, exist_ok=True)
     carousel = data.get('ig_carousel', [])
     title = data.get('title','')
     for i, slide_text in enumerate(carousel, start=1):
-        out_path = f'assets/images/slide{i:02d}.png'
+        out_path = os.path.join(images_dir, f'slide{i:02d}.png')
         prompt = f"A clean modern social media slide, minimal design, bold typography. Title: {title}. Text: {slide_text}. 1080x1350, high contrast, professional."
         try:
             if HF_API_KEY:
                 print('Requesting HF image for slide', i)
                 hf_generate_image(prompt, out_path)
+                errors = image_errors(out_path, 'slide')
+                if errors:
+                    raise RuntimeError('; '.join(errors))
             else:
                 raise RuntimeError('No HF key')
         except Exception as e:
             print('HF image generation failed, falling back to simple slide:', e)
             simple_slide(slide_text, out_path)
     # thumbnail
-    thumb_path = 'assets/thumbnail.png'
+    thumb_path = os.path.join(ASSETS_DIR,'thumbnail.png')
     try:
         prompt = f'YouTube thumbnail: {title}. Bold professional layout, readable text, 1280x720'
         if HF_API_KEY:
-            hf_generate_image(prompt, thumb_path)
+            hf_generate_image(prompt, thumb_path, 'thumbnail')
+            errors = image_errors(thumb_path, 'thumbnail')
+            if errors:
+                raise RuntimeError('; '.join(errors))
         else:
             raise RuntimeError('No HF key')
     except Exception as e:
         print('Thumbnail HF failed, creating fallback thumbnail:', e)
         simple_slide(title, thumb_path, size=(1280,720))
+    validate_images([os.path.join(images_dir, f'slide{i:02d}.png') for i in range(1, len(carousel) + 1)], 'slide')
+    validate_images([thumb_path], 'thumbnail')
     print('Image generation complete.')
 
 if __name__ == "__main__":
@@ -5,33 +5,53 @@ Generates content.json using the multi-model pipeline:
 2. ChatGPT for rewriting/humanizing (helpers.model_clients.rewrite_with_chatgpt)
 3. Gemini Nano for microtasks (helpers.model_clients.microtask_with_nano)
 
-Output: assets/content.json
+Output: $ASSETS_DIR/content.json (default assets/content.json)
 """
 import os, json
-from helpers.model_clients import gen_text_gemini, rewrite_with_chatgpt, microtask_with_nano
+from datetime import date
+from helpers.model_clients import gen_text_gemini, rewrite_with_chatgpt, microtask_with_nano, GEMINI_ENDPOINT, CHATGPT_API_KEY
+from helpers.prompt_templates import PromptVariables, render
+from helpers.json_extract import EXTRACTION_STATS, accumulate_stats, extract_content
+from helpers.validate_payloads import validate_content
+from helpers.artifact_store import default_store, key_for
 
-os.makedirs('assets', exist_ok=True)
+ASSETS_DIR = os.getenv('ASSETS_DIR', 'assets')
+os.makedirs(ASSETS_DIR, exist_ok=True)
 
-PROMPT_TEMPLATE = open('templates/prompt_templates.md').read()
+TOPIC = os.getenv('CONTENT_TOPIC', 'AI productivity hacks')
+TRENDING_SIGNALS = [s.strip() for s in os.getenv('TRENDING_SIGNALS', '').split(',') if s.strip()]
 
-def build_production_prompt():
-    # Simplified: in production you may add trending signals
-    return PROMPT_TEMPLATE + "\nTopic: AI productivity hacks.\nProvide JSON as specified."
+def build_production_prompt(topic=TOPIC, trending_signals=None):
+    # Only the Gemini section of templates/prompt_templates.md is sent
+    variables = PromptVariables(topic=topic, trending_signals=trending_signals or TRENDING_SIGNALS)
+    return render('gemini', variables)
 
 def main():
     prompt = build_production_prompt()
-    print('Generating primary content (Gemini)...')
-    raw = gen_text_gemini(prompt)
-    # Try to parse JSON output; if not valid, ask rewrite_with_chatgpt to structure it
-    try:
-        data = json.loads(raw)
-    except Exception:
+    # Reuse today's response for an identical prompt (reruns of the same day's workflow)
+    store = default_store()
+    cache_key = key_for('gemini', GEMINI_ENDPOINT, os.getenv('HF_TEXT_MODEL','gpt2'), prompt, date.today().isoformat())
+    cached = store.get_bytes(cache_key) if store else None
+    if cached is not None:
+        print('Using cached primary content (Gemini).')
+        raw = cached.decode('utf-8')
+    else:
+        print('Generating primary content (Gemini)...')
+        raw = gen_text_gemini(prompt)
+    # Extract JSON locally first; only pay for a ChatGPT restructure if that fails
+    data = extract_content(raw)
+    # Only cache usable responses so a same-day rerun can recover from a bad one
+    if store and cached is None and data is not None:
+        store.put_bytes(cache_key, raw.encode('utf-8'))
+    if data is None:
         print('Primary output not valid JSON, attempting to restructure via ChatGPT...')
+        if CHATGPT_API_KEY:  # rewrite_with_chatgpt is a no-op without a key
+            EXTRACTION_STATS['restructure'] += 1
         structured = rewrite_with_chatgpt(raw, instruction='Return a JSON object with keys: title, linkedin_post, x_post, ig_carousel (list), yt_script, hashtags')
-        try:
-            data = json.loads(structured)
-        except Exception:
+        data = extract_content(structured)
+        if data is None:
             print('Restructure failed — using heuristic extraction.')
+            EXTRACTION_STATS['heuristic'] += 1
             data = {
                 'title': (raw.split('\n')[0] if raw else 'AI Productivity'),
                 'linkedin_post': raw[:2000],
@@ -40,16 +60,22 @@ def main():
                 'yt_script': raw[:800],
                 'hashtags': microtask_with_nano('hashtags', raw)
             }
+    print('JSON extraction this run:', dict(EXTRACTION_STATS))
+    if store:
+        print('JSON extraction totals across runs:', dict(accumulate_stats(store)))
     # Post-process with ChatGPT for tone and virality
     print('Rewriting for tone with ChatGPT...')
     data['linkedin_post'] = rewrite_with_chatgpt(data.get('linkedin_post',''), 'Rewrite to be professional, concise, and include 3 actionable tips. Max 300 words.')
     data['x_post'] = rewrite_with_chatgpt(data.get('x_post',''), 'Make this a punchy 280-char post with 2 hashtags.')
     # microtasks
     data['hashtags'] = microtask_with_nano('hashtags', data.get('linkedin_post',''))
+    # Fail here, before any media is rendered for bad content
+    validate_content(data)
     # Save output
-    with open('assets/content.json','w') as f:
+    out_path = os.path.join(ASSETS_DIR, 'content.json')
+    with open(out_path,'w') as f:
         json.dump(data, f, indent=2)
-    print('Wrote assets/content.json')
+    print('Wrote', out_path)
 
 if __name__ == '__main__':
     main()
@@ -2,35 +2,110 @@
 
 High-level orchestrator that runs generation, assembly, then publishes to platforms.
 Supports SELF_TEST mode which validates payloads without posting.
+
+If an accounts config exists (ACCOUNTS_CONFIG, default accounts.json) it runs in
+multi-account mode: accounts sharing a topic and template share one generated asset set
+under assets/<group>/, and publishing fans out across all accounts in parallel, each
+with its own credentials, concurrency cap and minimum interval between publishes.
 """
 import os, subprocess, sys
+from concurrent.futures import ThreadPoolExecutor
+from helpers.validate_payloads import validate_all_payloads
+from helpers.accounts import ACCOUNTS_CONFIG, AccountLimiter, account_env, credential_problems, group_by_content, load_accounts
+from helpers.artifact_store import key_for
 
 SELF_TEST = os.getenv('SELF_TEST','false').lower()=='true'
 DRY = os.getenv('DRY_RUN','false').lower()=='true'
 
-def run_step(cmd):
-    print('Running:', ' '.join(cmd))
-    subprocess.check_call(cmd)
+def run_step(cmd, env=None, label=''):
+    print(f'{label}Running:', ' '.join(cmd))
+    subprocess.check_call(cmd, env=env)
+
+def generate(assets, env=None):
+    run_step(['python','scripts/generate_text.py'], env)
+    run_step(['python','scripts/generate_images.py',f'{assets}/content.json'], env)
+    run_step(['python','scripts/generate_audio.py',f'{assets}/content.json',f'{assets}/audio.mp3'], env)
+    run_step(['python','scripts/assemble_video.py',assets,f'{assets}/video_post.mp4'], env)
+
+def publish_commands(assets):
+    return {
+        'youtube': ['python','scripts/publish_youtube.py',f'{assets}/video_post.mp4'],
+        'instagram': ['python','scripts/publish_instagram.py',assets],
+        'linkedin': ['python','scripts/publish_linkedin.py',assets],
+        'x': ['python','scripts/publish_x.py'],
+    }
+
+def main_accounts(accounts):
+    groups = group_by_content(accounts)
+    print(f'{len(accounts)} accounts share {len(groups)} content groups')
+    group_assets = {}
+    for (topic, template), members in groups.items():
+        assets = os.path.join('assets', key_for(topic, template)[:12])
+        group_assets[(topic, template)] = assets
+        print(f'Generating {assets} for', ', '.join(a['name'] for a in members))
+        generate(assets, dict(os.environ, ASSETS_DIR=assets, CONTENT_TOPIC=topic, PROMPT_TEMPLATES=template))
+        if SELF_TEST:
+            validate_all_payloads(assets)
+    if SELF_TEST:
+        print('[SELF TEST] Completed successfully.')
+        return
+    if DRY:
+        os.environ['DRY_RUN'] = 'true'
+    jobs = []  # one list per account
+    failures = []
+    total = 0
+    for account in accounts:
+        assets = group_assets[(account['topic'], account['template'])]
+        env = dict(account_env(account, os.environ, accounts), ASSETS_DIR=assets)
+        limiter = AccountLimiter(account['max_concurrency'], account['min_interval_seconds'])
+        commands = publish_commands(assets)
+        account_jobs = []
+        for platform in account['platforms']:
+            total += 1
+            # publishers exit 0 on missing credentials, so catch unresolved secrets here
+            problems = credential_problems(account, platform, os.environ)
+            if problems:
+                print(f'[{account["name"]}/{platform}] Skipping, unresolved credentials:', '; '.join(problems))
+                failures.append(f'{account["name"]}/{platform}')
+                continue
+            account_jobs.append((account['name'], platform, commands[platform], env, limiter))
+        jobs.append(account_jobs)
+    def publish(job):
+        name, platform, cmd, env, limiter = job
+        with limiter:
+            try:
+                run_step(cmd, env, label=f'[{name}/{platform}] ')
+            except subprocess.CalledProcessError as e:
+                print(f'[{name}/{platform}] Publish failed:', e)
+                failures.append(f'{name}/{platform}')
+    # one executor per account, so an account waiting on its own limits never holds up the others
+    pools = [ThreadPoolExecutor(max_workers=max(1, a['max_concurrency'])) for a in accounts]
+    futures = [pool.submit(publish, job) for pool, account_jobs in zip(pools, jobs) for job in account_jobs]
+    for future in futures:
+        future.result()
+    for pool in pools:
+        pool.shutdown()
+    print(f'Publish fan-out completed: {total - len(failures)}/{total} succeeded.')
+    if failures:
+        print('Failed:', ', '.join(failures))
+        sys.exit(1)
 
 def main():
+    if os.path.exists(ACCOUNTS_CONFIG):
+        return main_accounts(load_accounts(ACCOUNTS_CONFIG))
     # generation pipeline
-    run_step(['python','scripts/generate_text.py'])
-    run_step(['python','scripts/generate_images.py','assets/content.json'])
-    run_step(['python','scripts/generate_audio.py','assets/content.json','assets/audio.mp3'])
-    run_step(['python','scripts/assemble_video.py','assets','assets/video_post.mp4'])
+    generate('assets')
     if SELF_TEST:
         print('[SELF TEST] Validating payloads (no external API calls will be made).')
-        # run validators
-        run_step(['python','-c','from helpers.validate_payloads import validate_all_payloads; validate_all_payloads()'])
+        # stages already validated their own output; this is a final in-process check
+        validate_all_payloads()
         print('[SELF TEST] Completed successfully.')
         return
     # Publishing (each script will handle its own auth and errors)
     if DRY:
         os.environ['DRY_RUN'] = 'true'
-    run_step(['python','scripts/publish_youtube.py','assets/video_post.mp4'])
-    run_step(['python','scripts/publish_instagram.py','assets'])
-    run_step(['python','scripts/publish_linkedin.py','assets'])
-    run_step(['python','scripts/publish_x.py'])
+    for cmd in publish_commands('assets').values():
+        run_step(cmd)
     print('Publish steps completed. Check logs above for details.')
 
 if __name__ == '__main__':
@@ -50,7 +50,7 @@ def main():
         print('Assets dir missing')
         return
     try:
-        with open(os.path.join('assets','content.json')) as f:
+        with open(os.path.join(assets_dir,'content.json')) as f:
             content = json.load(f)
     except Exception as e:
         print('content.json missing or invalid', e)
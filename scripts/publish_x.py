@@ -16,6 +16,7 @@ X_ACCESS_TOKEN = os.getenv('X_ACCESS_TOKEN')
 X_ACCESS_TOKEN_SECRET = os.getenv('X_ACCESS_TOKEN_SECRET')
 X_BEARER = os.getenv('X_BEARER_TOKEN')
 DRY = os.getenv('DRY_RUN','false').lower()=='true'
+ASSETS_DIR = os.getenv('ASSETS_DIR', 'assets')
 
 def post_text_v2(text):
     url = 'https://api.twitter.com/2/tweets'
@@ -34,7 +35,7 @@ def post_with_user_oauth(text):
 
 def main():
     try:
-        with open('assets/content.json') as f:
+        with open(os.path.join(ASSETS_DIR,'content.json')) as f:
             data = json.load(f)
     except Exception:
         data = {'x_post':'Automated post'}
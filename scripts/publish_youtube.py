@@ -7,11 +7,13 @@ Environment variables required:
 - YOUTUBE_CLIENT_SECRET
 - YOUTUBE_REFRESH_TOKEN
 
-The script performs a resumable upload and uploads a thumbnail (assets/thumbnail.png).
+The script performs a resumable upload and uploads a thumbnail ($ASSETS_DIR/thumbnail.png).
 """
 import os, sys
 import json
 
+ASSETS_DIR = os.getenv('ASSETS_DIR', 'assets')
+
 def upload_with_google_client(video_file, title, description, tags):
     try:
         from google.oauth2.credentials import Credentials
@@ -44,21 +46,21 @@ def upload_with_google_client(video_file, title, description, tags):
     video_id = response.get('id')
     print('Uploaded video id:', video_id)
     # upload thumbnail
-    thumb = 'assets/thumbnail.png'
+    thumb = os.path.join(ASSETS_DIR,'thumbnail.png')
     if os.path.exists(thumb):
         youtube.thumbnails().set(videoId=video_id, media_body=MediaFileUpload(thumb)).execute()
         print('Thumbnail uploaded.')
     return True
 
 def main():
-    video_file = sys.argv[1] if len(sys.argv)>1 else 'assets/video_post.mp4'
+    video_file = sys.argv[1] if len(sys.argv)>1 else os.path.join(ASSETS_DIR,'video_post.mp4')
     if not os.path.exists(video_file):
         print('Video file not found:', video_file)
         return
     # load metadata
     meta = {}
     try:
-        with open('assets/content.json') as f:
+        with open(os.path.join(ASSETS_DIR,'content.json')) as f:
             meta = json.load(f)
     except Exception:
         pass